@@ -1,25 +1,6 @@
 import streamlit as st
-import sys
-import os
-from pathlib import Path
 
 
-
-# Add panels to path
-current_dir = Path(__file__).parent
-panels_dir = current_dir / "panels"
-sys.path.insert(0, str(panels_dir))
-
-# Import panels
-try:
-    from panels import news
-    from panels import sec_filings
-    from panels import discounts  # Now properly implemented
-    # Import other existing panels
-    # import performance
-except ImportError as e:
-    st.error(f"Error importing panels: {e}")
-
 def main():
     st.set_page_config(
         page_title="CEF Dashboard",
@@ -44,13 +25,20 @@ def main():
             ]
         )
     
+    # Import the selected panel lazily so only its dependencies load per rerun
+    try:
+        if panel_choice == "📰 News & Announcements":
+            from panels import news as panel
+        elif panel_choice == "📋 SEC Filings Monitor":
+            from panels import sec_filings as panel
+        elif panel_choice == "💰 Discount Analysis":
+            from panels import discounts as panel
+    except ImportError as e:
+        st.error(f"Error importing panels: {e}")
+        return
+
     # Render selected panel
-    if panel_choice == "📰 News & Announcements":
-        news.render()
-    elif panel_choice == "📋 SEC Filings Monitor":
-        sec_filings.render()
-    elif panel_choice == "💰 Discount Analysis":
-        discounts.render()
+    panel.render()
 
 if __name__ == "__main__":
     main()
@@ -1,60 +1,127 @@
 import requests
 import pandas as pd
 from bs4 import BeautifulSoup
-import json
-import time
+import orjson
+import random
+import re
 import logging
-from datetime import datetime, timedelta
+from io import StringIO
+from datetime import date, datetime, timedelta
+from pathlib import Path
 from typing import Dict, List, Optional
-from fake_useragent import UserAgent
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Connection pool sized so concurrent sessions sharing the fetcher never wait on a socket
+POOL_SIZE = 32
+
+# Parsed price histories, persisted per (ticker, period, day) across restarts
+HISTORY_CACHE_DIR = Path("data") / "cache" / "historical"
+
+# Define the CEF universe to track
+CEF_FUNDS = {
+    "PDO": ("PIMCO Dynamic Income Opportunities Fund"),
+    "PDI": ("PIMCO Dynamic Income Fund"),
+    "PHK": ("PIMCO High Income Fund"),
+    "BST": ("BlackRock Science & Tech Trust"),
+    "BDJ": ("BlackRock Enhanced Equity Dividend Trust"),
+    "JFR": ("Nuveen Floating Rate Income Fund"),
+    "ETG": ("Eaton Vance Tax-Advantaged Global Dividend Opportunities"),
+    "ASA": ("ASA Gold and Precious Metals Limited"),
+    "SWZ": ("Swiss Helvetia Fund"),
+    "ECF": ("Ellsworth Growth & Income Fund Ltd"),
+    "BCV": ("Bancroft Fund Ltd"),
+    "NBXG": ("Neuberger Berman NextGen Connectivity Fund Inc."),
+    "JOF": ("Japan Smaller Capitalization Fund"),
+    "GAM": ("General American Investors Company Inc."),
+    "BIGZ": ("BlackRock Innovation & Growth Trust"),
+    "BMEZ": ("BlackRock Health Sciences Trust II"),
+    "TTP": ("Tortoise Pipeline & Energy Fund Inc."),
+}
+CEF_TICKERS = frozenset(CEF_FUNDS)
+# Canonical ticker → fund_name table for vectorized joins against fetched data
+CEF_UNIVERSE = pd.DataFrame(
+    {'ticker': list(CEF_FUNDS), 'fund_name': list(CEF_FUNDS.values())}
+).set_index('ticker')
+
+# DailyPricing API field → dashboard column
+API_COLUMNS = {
+    'Ticker': 'ticker',
+    'Name': 'fund_name',
+    'Price': 'market_price',
+    'NAV': 'nav',
+    'Discount': 'discount_percent',
+    'DistributionRatePrice': 'distribution_rate',
+    'LastUpdated': 'last_updated',
+}
+API_NUMERIC_COLUMNS = ['Price', 'NAV', 'Discount', 'DistributionRatePrice']
+# A fund quote is unusable without these; rows missing one are dropped, not zeroed
+API_REQUIRED_COLUMNS = ['Price', 'NAV', 'Discount']
+
+# pricinghistory API field → dashboard column
+HISTORY_COLUMNS = {
+    'DataDateDisplay': 'date',
+    'Price': 'market_price',
+    'NAV': 'nav',
+    'DiscountPremium': 'discount_percent',
+}
+HISTORY_NUMERIC_COLUMNS = ['Price', 'NAV', 'DiscountPremium']
+# The chart plots price and NAV by date; days missing any of them are dropped
+HISTORY_REQUIRED_COLUMNS = ['DataDateDisplay', 'Price', 'NAV']
+
+# Static desktop browser user agents, rotated per fetcher
+_UA_POOL = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+)
+
+# Positional layout of the CEFConnect daily pricing table
+PRICING_COLUMNS = ['ticker', 'fund_name', 'market_price', 'nav', 'discount_percent', 'distribution_rate']
+# Currency/percent decoration stripped from scraped numeric cells
+_NUMERIC_JUNK_RE = re.compile(r'[$%,]')
+
 class CEFDiscountFetcher:
     """Fetch real-time CEF discount data from CEFConnect"""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Path | str = HISTORY_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        # (url, params) → (ETag, Last-Modified, parsed body) for conditional GETs
+        self._validators: Dict[tuple, tuple] = {}
         self.base_url = "https://www.cefconnect.com"
         self.api_base = f"{self.base_url}/api/v3"
         self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=POOL_SIZE,
+            pool_maxsize=POOL_SIZE,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['HEAD', 'GET'],
+            ),
+        )
+        self.session.mount("https://", adapter)
         self.setup_session()
         
-        # Define the CEF universe to track
-        self.cef_funds = {
-            "PDO": ("PIMCO Dynamic Income Opportunities Fund"),
-            "PDI": ("PIMCO Dynamic Income Fund"),
-            "PHK": ("PIMCO High Income Fund"),
-            "BST": ("BlackRock Science & Tech Trust"),
-            "BDJ": ("BlackRock Enhanced Equity Dividend Trust"),
-            "JFR": ("Nuveen Floating Rate Income Fund"),
-            "ETG": ("Eaton Vance Tax-Advantaged Global Dividend Opportunities"),
-            "ASA": ("ASA Gold and Precious Metals Limited"),
-            "SWZ": ("Swiss Helvetia Fund"),
-            "ECF": ("Ellsworth Growth & Income Fund Ltd"),
-            "BCV": ("Bancroft Fund Ltd"),
-            "NBXG": ("Neuberger Berman NextGen Connectivity Fund Inc."),
-            "JOF": ("Japan Smaller Capitalization Fund"),
-            "GAM": ("General American Investors Company Inc."),
-            "BIGZ": ("BlackRock Innovation & Growth Trust"),
-            "BMEZ": ("BlackRock Health Sciences Trust II"),
-            "TTP": ("Tortoise Pipeline & Energy Fund Inc."),
-        }
+        # CEF universe to track (shared, built once at import)
+        self.cef_funds = CEF_FUNDS
+        self._tickers = CEF_TICKERS
     
     def setup_session(self):
         """Setup session with realistic headers"""
-        try:
-            ua = UserAgent()
-            user_agent = ua.chrome
-        except:
-            user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36'
-        
         self.session.headers.update({
-            'User-Agent': user_agent,
+            'User-Agent': random.choice(_UA_POOL),
             'Accept': 'application/json, text/plain, */*',
             'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
+            # Only advertise encodings urllib3 can decode (br needs brotli installed)
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         })
@@ -95,31 +162,61 @@ class CEFDiscountFetcher:
         params = {
             'props': 'Ticker,Name,Price,NAV,Discount,DistributionRatePrice,LastUpdated',
             'tickers': ticker_query,
-            '_': int(time.time() * 1000)  # Cache buster
         }
         
-        response = self.session.get(api_url, params=params, timeout=30)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = self._get_json(api_url, params=params)
         
         if not data:
             return []
         
-        processed_data = []
-        for item in data:
-            if item.get('Ticker') in self.cef_funds:
-                processed_data.append({
-                    'ticker': item.get('Ticker', ''),
-                    'fund_name': item.get('Name', ''),
-                    'market_price': float(item.get('Price', 0)),
-                    'nav': float(item.get('NAV', 0)),
-                    'discount_percent': float(item.get('Discount', 0)),
-                    'distribution_rate': float(item.get('DistributionRatePrice', 0)),
-                    'last_updated': item.get('LastUpdated', datetime.now().isoformat())
-                })
-        
-        return processed_data
+        # Filter and coerce the whole payload at once instead of row by row
+        df = pd.DataFrame(data).reindex(columns=list(API_COLUMNS))
+        df = df[df['Ticker'].isin(self._tickers)]
+        if df.empty:
+            return []
+        
+        for src in API_NUMERIC_COLUMNS:
+            df[src] = pd.to_numeric(df[src], errors='coerce')
+        # Null or garbage quotes must not reach the metrics as 0.0; if every row is
+        # dropped the empty result sends fetch_all_discounts to the scraping fallback
+        df = df.dropna(subset=API_REQUIRED_COLUMNS)
+        if df.empty:
+            return []
+        df['DistributionRatePrice'] = df['DistributionRatePrice'].fillna(0.0)
+        df[API_NUMERIC_COLUMNS] = df[API_NUMERIC_COLUMNS].astype(float)
+        df['Name'] = df['Name'].fillna('')
+        df['LastUpdated'] = df['LastUpdated'].fillna(datetime.now().isoformat())
+        
+        # Backfill missing names from the canonical universe in one join
+        df = df.rename(columns=API_COLUMNS).join(CEF_UNIVERSE, on='ticker', rsuffix='_canon')
+        df['fund_name'] = df['fund_name'].mask(df['fund_name'] == '', df['fund_name_canon'])
+        return df.drop(columns='fund_name_canon').to_dict('records')
+    
+    def _get_json(self, url: str, params: Optional[Dict] = None):
+        """GET and decode a JSON endpoint, revalidating the last body with ETag/Last-Modified"""
+        key = (url, tuple(sorted((params or {}).items())))
+        cached = self._validators.get(key)
+        
+        headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        
+        response = self.session.get(url, params=params, headers=headers, timeout=30)
+        if response.status_code == 304 and cached:
+            # Unchanged upstream: no body transferred, reuse the previous parse
+            return cached[2]
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if etag or last_modified:
+            self._validators[key] = (etag, last_modified, data)
+        return data
     
     def fetch_via_scraping(self) -> List[Dict]:
         """Fallback scraping method"""
@@ -131,74 +228,114 @@ class CEFDiscountFetcher:
         response = self.session.get(pricing_url, timeout=30)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Parse the pricing table in C via lxml; fall back to bs4 if pandas finds nothing usable
+        try:
+            tables = pd.read_html(StringIO(response.text), flavor='lxml')
+        except (ValueError, ImportError) as e:
+            logger.warning(f"read_html failed, falling back to BeautifulSoup: {e}")
+            tables = []
+        
+        if tables and tables[0].shape[1] >= len(PRICING_COLUMNS):
+            return self._parse_pricing_table(tables[0])
+        
+        return self._scrape_with_bs4(response.content)
+    
+    def _parse_pricing_table(self, table: pd.DataFrame) -> List[Dict]:
+        """Vectorized cleanup of the scraped pricing table"""
+        df = table.iloc[:, :len(PRICING_COLUMNS)].copy()
+        df.columns = PRICING_COLUMNS
+        df['ticker'] = df['ticker'].astype(str).str.strip()
+        df = df[df['ticker'].isin(self._tickers)]
+        
+        for col in PRICING_COLUMNS[2:]:
+            cleaned = df[col].astype(str).str.replace(_NUMERIC_JUNK_RE, '', regex=True)
+            df[col] = pd.to_numeric(cleaned, errors='coerce')
         
-        # Look for data table
-        processed_data = []
+        # Rows with unparseable numbers are skipped, as in the row-by-row parser
+        df = df.dropna(subset=PRICING_COLUMNS[2:])
+        df['fund_name'] = df['fund_name'].astype(str).str.strip()
+        df['last_updated'] = datetime.now().isoformat()
+        return df.to_dict('records')
+    
+    def _scrape_with_bs4(self, content: bytes) -> List[Dict]:
+        """Last-resort bs4 parse for pages pandas cannot read"""
+        soup = BeautifulSoup(content, 'lxml')
         
         # Find the main data table
         table = soup.find('table') or soup.find('div', {'class': 'data-table'})
+        if not table:
+            return []
         
-        if table:
-            rows = table.find_all('tr')[1:]  # Skip header
-            
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 6:
-                    try:
-                        ticker = cells[0].get_text(strip=True)
-                        
-                        if ticker in self.cef_funds:
-                            name = cells[1].get_text(strip=True)
-                            price_text = cells[2].get_text(strip=True).replace('$', '')
-                            nav_text = cells[3].get_text(strip=True).replace('$', '')
-                            discount_text = cells[4].get_text(strip=True).replace('%', '')
-                            dist_text = cells[5].get_text(strip=True).replace('%', '') if len(cells) > 5 else '0'
-                            
-                            processed_data.append({
-                                'ticker': ticker,
-                                'fund_name': name,
-                                'market_price': float(price_text),
-                                'nav': float(nav_text),
-                                'discount_percent': float(discount_text),
-                                'distribution_rate': float(dist_text),
-                                'last_updated': datetime.now().isoformat()
-                            })
-                    except (ValueError, IndexError):
-                        continue
-        
-        return processed_data
+        # Collect raw cell text only; numeric cleanup happens once on the whole table
+        rows = []
+        for row in table.find_all('tr')[1:]:  # Skip header
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= len(PRICING_COLUMNS):
+                rows.append([c.get_text(strip=True) for c in cells[:len(PRICING_COLUMNS)]])
+        
+        if not rows:
+            return []
+        return self._parse_pricing_table(pd.DataFrame(rows))
     
     def fetch_historical_data(self, ticker: str, period: str = "1Y") -> List[Dict]:
         """Fetch historical price data for a specific fund"""
-        if ticker not in self.cef_funds:
+        if ticker not in self._tickers:
             logger.error(f"Ticker {ticker} not in tracked funds")
             return []
         
+        # History changes at most daily, so today's parsed copy on disk is authoritative
+        cache_file = self.cache_dir / f"{ticker}_{period}_{date.today().isoformat()}.json"
+        try:
+            return orjson.loads(cache_file.read_bytes())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable history cache {cache_file}: {e}")
+        
+        history = self._fetch_historical_uncached(ticker, period)
+        if history:
+            self._store_history(cache_file, history)
+        return history
+    
+    def _store_history(self, cache_file: Path, history: List[Dict]):
+        """Write today's history atomically and drop older days for the same fund/period"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            prefix = cache_file.name.rsplit('_', 1)[0]
+            for stale in self.cache_dir.glob(f"{prefix}_*.json"):
+                if stale != cache_file:
+                    stale.unlink(missing_ok=True)
+            
+            tmp_file = cache_file.with_suffix('.tmp')
+            tmp_file.write_bytes(orjson.dumps(history))
+            tmp_file.replace(cache_file)
+        except OSError as e:
+            logger.warning(f"Could not write history cache {cache_file}: {e}")
+    
+    def _fetch_historical_uncached(self, ticker: str, period: str) -> List[Dict]:
+        """Download and parse the price history for a tracked fund"""
         try:
             # Historical data API endpoint
             hist_url = f"{self.api_base}/pricinghistory/{ticker}/{period}"
             
-            response = self.session.get(hist_url, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = self._get_json(hist_url)
             
             if not data or 'Data' not in data:
                 return []
             
             price_history = data['Data'].get('PriceHistory', [])
+            if not price_history:
+                return []
             
-            processed_history = []
-            for item in price_history:
-                processed_history.append({
-                    'date': item.get('DataDateDisplay', ''),
-                    'market_price': float(item.get('Price', 0)),
-                    'nav': float(item.get('NAV', 0)),
-                    'discount_percent': float(item.get('DiscountPremium', 0))
-                })
+            # Project only the fields we chart; other per-day keys are never materialized
+            df = pd.DataFrame.from_records(price_history, columns=list(HISTORY_COLUMNS))
+            df['DataDateDisplay'] = df['DataDateDisplay'].replace('', None)
+            for src in HISTORY_NUMERIC_COLUMNS:
+                df[src] = pd.to_numeric(df[src], errors='coerce').astype(float)
+            # Undated or unpriced days would plot as NaT/zero spikes and be cached to disk
+            df = df.dropna(subset=HISTORY_REQUIRED_COLUMNS)
             
-            return processed_history
+            return df.rename(columns=HISTORY_COLUMNS).to_dict('records')
             
         except Exception as e:
             logger.error(f"Error fetching historical data for {ticker}: {e}")
@@ -211,7 +348,8 @@ class CEFDiscountFetcher:
     def test_connection(self) -> bool:
         """Test connection to CEFConnect"""
         try:
-            response = self.session.get(self.base_url, timeout=10)
-            return response.status_code == 200
+            # Headers only; no need to download the homepage to check reachability
+            response = self.session.head(self.base_url, timeout=5, allow_redirects=True)
+            return response.status_code < 400
         except:
             return False
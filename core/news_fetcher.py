@@ -2,18 +2,27 @@ from __future__ import annotations
 
 import hashlib
 import logging
+import math
 import os
 import re
+import threading
 import time
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta, timezone
+from operator import attrgetter
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
 import feedparser
+import lxml.html
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from dateutil import parser as dateparser
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ---------------------------------------------------------------------------
 # Configuration & logging
@@ -22,10 +31,35 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+RSS_WORKERS = 8  # one in-flight request per feed
+NEWSAPI_WORKERS = 4  # concurrent NewsAPI queries
+POOL_HOSTS = 16  # distinct hosts whose connections stay pooled
+HOST_MIN_INTERVAL = 1.0  # seconds between scrape/feed requests to the same host
+CLASSIFY_CACHE_SIZE = 10_000  # classification results remembered across cycles
+DEDUP_THRESHOLD = 0.7  # Jaccard similarity above which two articles are duplicates
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_WORD_RE = re.compile(r"\w+")
+
+
+def _article_id(url: str, title: str = "") -> str:
+    """Stable dedup id for an article; not a security boundary, so use fast BLAKE2b."""
+    # Feeding the parts separately hashes the same bytes as url + title
+    # without building the concatenated string first
+    h = hashlib.blake2b(url.encode(), digest_size=16)
+    if title:
+        h.update(title.encode())
+    return h.hexdigest()
+
+
+def _tokenize(text: str) -> Tuple[str, frozenset]:
+    """Lowercase text plus its set of word tokens, in one pass."""
+    lowered = text.lower()
+    return lowered, frozenset(_WORD_RE.findall(lowered))
+
 # ---------------------------------------------------------------------------
 # Data classes
 # ---------------------------------------------------------------------------
-@dataclass
+@dataclass(slots=True)
 class EnhancedNewsArticle:
     id: str
     title: str
@@ -39,17 +73,16 @@ class EnhancedNewsArticle:
     priority_score: float = 1.0
     sentiment_score: float = 0.0
     relevance_score: float = 0.5
-    tickers: List[str] = None
-    fund_names: List[str] = None
-    activist_mentions: List[str] = None
-
-    def __post_init__(self) -> None:
-        self.tickers = self.tickers or []
-        self.fund_names = self.fund_names or []
-        self.activist_mentions = self.activist_mentions or []
+    tickers: List[str] = field(default_factory=list)
+    fund_names: List[str] = field(default_factory=list)
+    activist_mentions: List[str] = field(default_factory=list)
 
     def to_dict(self) -> Dict:
-        return asdict(self)
+        # Flat record: shallow field copy, no asdict() deepcopy/recursion
+        return {name: getattr(self, name) for name in _ARTICLE_FIELDS}
+
+
+_ARTICLE_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(EnhancedNewsArticle))
 
 
 # ---------------------------------------------------------------------------
@@ -142,6 +175,48 @@ class EnhancedCEFNewsClassifier:
             "Ancora Advisors",
         ]
 
+        # Lowercased forms paired with the canonical spelling, built once so
+        # the per-article loops below never call str.lower()
+        self._fullnames_lc: List[Tuple[str, str, str]] = [
+            (n, n.lower(), self.name_to_ticker[n]) for n in self.cef_full_names
+        ]
+        self._tickers_lc: List[Tuple[str, str]] = [(t, t.lower()) for t in self.cef_tickers]
+        self._activists_lc: List[Tuple[str, str]] = [(f, f.lower()) for f in self.activist_firms]
+
+        # One precompiled alternation per term kind: a single scan of the text
+        # replaces one substring test per term. Longest terms first so a
+        # shorter term can never shadow a longer one at the same position.
+        self._fullname_re = self._compile_terms(self.cef_full_names)
+        self._keyword_re = self._compile_terms(self.cef_keywords)
+        self._activist_re = self._compile_terms(self.activist_firms)
+        # Tickers are whole words, so a set intersection with the article's
+        # tokens finds them all without scanning the text again
+        self._ticker_tokens = frozenset(lc for _, lc in self._tickers_lc)
+
+        # Category heuristics, checked in order; the first matching rule wins
+        category_terms: List[Tuple[str, List[str]]] = [
+            ("activist_activity", ["activist", "proxy", "tender"]),
+            ("distributions", ["distribution", "dividend", "yield"]),
+            ("corporate_actions", ["merger", "liquidation", "conversion"]),
+        ]
+        self._category_rules: List[Tuple[str, re.Pattern]] = [
+            (name, self._compile_terms(terms)) for name, terms in category_terms
+        ]
+
+        # Union of every substring term above: one scan tells us whether an
+        # article can score at all, so off-topic articles skip the rest
+        self._domain_re = self._compile_terms(
+            self.cef_full_names
+            + self.cef_keywords
+            + self.activist_firms
+            + [t for _, terms in category_terms for t in terms]
+        )
+
+    @staticmethod
+    def _compile_terms(terms: List[str]) -> re.Pattern:
+        lowered = sorted({t.lower() for t in terms}, key=len, reverse=True)
+        return re.compile("|".join(re.escape(t) for t in lowered))
+
     # ---------------------------------------------------------------------
     # Single-article scoring
     # ---------------------------------------------------------------------
@@ -149,7 +224,9 @@ class EnhancedCEFNewsClassifier:
         self, title: str, content: str
     ) -> Tuple[str, float, float, List[str], List[str], List[str]]:
         """Return category, relevance, sentiment, tickers, fund-names, activists."""
-        text = f"{title or ''} {content or ''}".lower()
+        text, tokens = _tokenize(f"{title or ''} {content or ''}")
+        if self._ticker_tokens.isdisjoint(tokens) and not self._domain_re.search(text):
+            return "general", 0.0, 0.0, [], [], []
 
         relevance = 0.0
         found_tickers: List[str] = []
@@ -157,45 +234,49 @@ class EnhancedCEFNewsClassifier:
         found_activists: List[str] = []
 
         # --- full fund names (strongest) ----------------------------------
-        for fullname in self.cef_full_names:
-            if fullname.lower() in text:
-                relevance += 0.6
-                found_fund_names.append(fullname)
-                found_tickers.append(self.name_to_ticker[fullname])
+        name_hits = set(self._fullname_re.findall(text))
+        if name_hits:
+            for fullname, fullname_lc, tkr in self._fullnames_lc:
+                if fullname_lc in name_hits:
+                    relevance += 0.6
+                    found_fund_names.append(fullname)
+                    found_tickers.append(tkr)
 
         # --- ticker match (medium) with ASA special case ------------------
-        for tkr in self.cef_tickers:
-            if re.search(rf"\b{re.escape(tkr.lower())}\b", text):
-                # ignore Norwegian ASA company confusion
-                if tkr == "ASA" and ("norway" in text or "norwegian" in text):
-                    continue
-                relevance += 0.3
-                if tkr not in found_tickers:
-                    found_tickers.append(tkr)
+        ticker_hits = self._ticker_tokens & tokens
+        if ticker_hits:
+            for tkr, tkr_lc in self._tickers_lc:
+                if tkr_lc in ticker_hits:
+                    # ignore Norwegian ASA company confusion
+                    if tkr == "ASA" and ("norway" in text or "norwegian" in text):
+                        continue
+                    relevance += 0.3
+                    if tkr not in found_tickers:
+                        found_tickers.append(tkr)
 
         # --- generic keywords (weak) -------------------------------------
-        if any(kw in text for kw in self.cef_keywords):
+        if self._keyword_re.search(text):
             relevance += 0.1
 
         # --- activist firms ----------------------------------------------
-        for firm in self.activist_firms:
-            if firm.lower() in text:
-                if firm == "Saba Capital":
-                    relevance += 1.0  # Highest priority
-                else:
-                    relevance += 0.5
-                found_activists.append(firm)
+        activist_hits = set(self._activist_re.findall(text))
+        if activist_hits:
+            for firm, firm_lc in self._activists_lc:
+                if firm_lc in activist_hits:
+                    if firm == "Saba Capital":
+                        relevance += 1.0  # Highest priority
+                    else:
+                        relevance += 0.5
+                    found_activists.append(firm)
         relevance = min(relevance, 1.0)
         sentiment = 0.0  # placeholder – real model could replace this
 
         # Category heuristics
         category = "general"
-        if any(w in text for w in ["activist", "proxy", "tender"]):
-            category = "activist_activity"
-        elif any(w in text for w in ["distribution", "dividend", "yield"]):
-            category = "distributions"
-        elif any(w in text for w in ["merger", "liquidation", "conversion"]):
-            category = "corporate_actions"
+        for name, pattern in self._category_rules:
+            if pattern.search(text):
+                category = name
+                break
 
         return category, relevance, sentiment, found_tickers, found_fund_names, found_activists
 
@@ -210,7 +291,14 @@ class CEFNewsFetcher:
         self._setup_api_keys()
         self.classifier = EnhancedCEFNewsClassifier()
         self.article_cache: set[str] = set()
+        # digest of classified text -> classify_article() result, LRU-bounded; survives cycles
+        self._classified: OrderedDict[str, Tuple] = OrderedDict()
         self.session = requests.Session()
+        # Requests to the same host are serialized; different hosts run in parallel
+        self._host_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._host_last_request: Dict[str, float] = {}
+        # feed name -> (ETag, Last-Modified, entries) for conditional GETs
+        self._feed_validators: Dict[str, Tuple[Optional[str], Optional[str], List]] = {}
         self._setup_session()
         self._setup_feeds()
 
@@ -223,6 +311,22 @@ class CEFNewsFetcher:
         }
 
     def _setup_session(self) -> None:
+        # One keep-alive pool per host, sized for the widest fan-out; with the
+        # default sizing concurrent phases could drop and reopen connections.
+        # Throttling (429) and transient 5xx answers are retried with backoff
+        # on the pooled connection instead of dropping that source for a cycle.
+        adapter = HTTPAdapter(
+            pool_connections=POOL_HOSTS,
+            pool_maxsize=max(RSS_WORKERS, NEWSAPI_WORKERS),
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET"],
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update(
             {
                 "User-Agent": (
@@ -251,31 +355,67 @@ class CEFNewsFetcher:
             "blackrock_news": "https://tcpcapital.com/rss/pressrelease.aspx",
         }
 
+    def _polite_get(self, url: str, **kwargs) -> requests.Response:
+        """GET with per-host pacing: one request at a time, HOST_MIN_INTERVAL apart."""
+        host = urlparse(url).netloc
+        with self._host_locks[host]:
+            last = self._host_last_request.get(host)
+            if last is not None:
+                wait = HOST_MIN_INTERVAL - (time.monotonic() - last)
+                if wait > 0:
+                    time.sleep(wait)
+            try:
+                return self.session.get(url, **kwargs)
+            finally:
+                self._host_last_request[host] = time.monotonic()
+
     # --------------------------------------------------------------------
     # Feed and webpage loaders
     # --------------------------------------------------------------------
     def _fetch_rss_feeds(self) -> List[Dict]:
+        # Download + parse concurrently, then build articles in feed order
+        workers = min(RSS_WORKERS, len(self.rss_feeds)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            feeds = list(pool.map(lambda item: self._fetch_one_feed(*item), self.rss_feeds.items()))
+
         articles: List[Dict] = []
-        for name, url in self.rss_feeds.items():
-            try:
-                logger.info("Fetching from %s", name)
-                time.sleep(2)  # basic rate-limit
-                feed = feedparser.parse(url)
-                for entry in feed.entries[:20]:  # latest 20 each
-                    art = self._parse_rss_entry(entry, name)
-                    if art:
-                        articles.append(art)
-            except Exception as exc:
-                logger.error("RSS error (%s): %s", name, exc)
+        for name, entries in zip(self.rss_feeds, feeds):
+            for entry in entries:
+                art = self._parse_rss_entry(entry, name)
+                if art:
+                    articles.append(art)
         return articles
 
+    def _fetch_one_feed(self, name: str, url: str) -> List:
+        try:
+            logger.info("Fetching from %s", name)
+            cached = self._feed_validators.get(name)
+            headers = {}
+            if cached:
+                etag, last_modified, _ = cached
+                if etag:
+                    headers["If-None-Match"] = etag
+                if last_modified:
+                    headers["If-Modified-Since"] = last_modified
+            resp = self._polite_get(url, headers=headers, timeout=15)
+            if resp.status_code == 304 and cached:
+                # Feed unchanged: reuse the entries parsed last time
+                return cached[2]
+            resp.raise_for_status()
+            entries = feedparser.parse(resp.content).entries[:20]  # latest 20 each
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._feed_validators[name] = (etag, last_modified, entries)
+            return entries
+        except Exception as exc:
+            logger.error("RSS error (%s): %s", name, exc)
+            return []
+
     def _parse_rss_entry(self, entry, source: str) -> Optional[Dict]:
         try:
             published_at = self._parse_date(entry) or datetime.utcnow()
-            art_id = hashlib.md5(f"{entry.get('link','')}{entry.get('title','')}".encode()).hexdigest()
-            if art_id in self.article_cache:
-                return None
-            self.article_cache.add(art_id)
+            art_id = _article_id(entry.get("link", ""), entry.get("title", ""))
             url = entry.get("link", "")
             if not url:
                 return None
@@ -299,19 +439,26 @@ class CEFNewsFetcher:
 
     @staticmethod
     def _parse_date(entry) -> Optional[datetime]:
-        date_fields = ["published", "updated", "pubDate", "published_parsed"]
-        for fld in date_fields:
-            if hasattr(entry, fld):
+        # feedparser's *_parsed fields are already-parsed UTC struct_times;
+        # only fall back to parsing the raw strings when they are missing
+        for fld in ("published_parsed", "updated_parsed"):
+            val = entry.get(fld)
+            if val:
                 try:
-                    val = getattr(entry, fld)
-                    if isinstance(val, str):
-                        from dateutil import parser as dateparser
-
-                        return dateparser.parse(val)
-                    elif hasattr(val, "timetuple"):
-                        return datetime(*val.timetuple()[:6])
-                except Exception:
+                    return datetime(*val[:6])
+                except (TypeError, ValueError):
                     continue
+        for fld in ("published", "updated", "pubDate"):
+            val = entry.get(fld)
+            if isinstance(val, str):
+                try:
+                    parsed = dateparser.parse(val)
+                except (ValueError, OverflowError):
+                    continue
+                # Offset-aware strings are converted, so every branch yields naive UTC
+                if parsed.tzinfo is not None:
+                    parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+                return parsed
         return None
 
     # --------------------------------------------------------------------
@@ -321,19 +468,18 @@ class CEFNewsFetcher:
         arts: List[Dict] = []
         try:
             url = "https://seekingalpha.com/etfs-and-funds/closed-end-funds"
-            time.sleep(3)
-            resp = self.session.get(url, timeout=30)
-            if resp.status_code != 200:
-                return arts
-            soup = BeautifulSoup(resp.content, "html.parser")
-            links = soup.find_all("a", {"data-test-id": "post-list-item-title"})
-            for a in links[:15]:
+            # Stream the (decompressed) body straight into libxml2 instead of
+            # buffering it in resp.content first
+            with self._polite_get(url, stream=True, timeout=30) as resp:
+                if resp.status_code != 200:
+                    return arts
+                resp.raw.decode_content = True
+                doc = lxml.html.parse(resp.raw).getroot()
+            # Query the libxml2 tree directly; no BeautifulSoup object layer
+            for a in doc.xpath('//a[@data-test-id="post-list-item-title"]')[:15]:
                 href = urljoin(url, a.get("href"))
-                title = a.get_text(strip=True)
-                art_id = hashlib.md5(href.encode()).hexdigest()
-                if art_id in self.article_cache:
-                    continue
-                self.article_cache.add(art_id)
+                title = "".join(s.strip() for s in a.itertext())
+                art_id = _article_id(href)
                 arts.append(
                     {
                         "id": art_id,
@@ -363,32 +509,16 @@ class CEFNewsFetcher:
             f"({' OR '.join(self.classifier.cef_tickers[:10])})",
             f"({' OR '.join(self.classifier.fund_families[:5])})",
         ]
-        raw: List[Dict] = []
-        for q in queries:
-            try:
-                time.sleep(2)
-                url = "https://newsapi.org/v2/everything"
-                params = {
-                    "q": q,
-                    "from": (datetime.utcnow() - timedelta(days=14)).strftime("%Y-%m-%d"),
-                    "sortBy": "publishedAt",
-                    "language": "en",
-                    "pageSize": 30,
-                    "apiKey": self.api_keys["newsapi"],
-                }
-                r = requests.get(url, params=params, timeout=30)
-                if r.status_code == 200:
-                    raw.extend(r.json().get("articles", []))
-            except Exception as exc:
-                logger.error("NewsAPI error (%s): %s", q, exc)
+        queries = list(dict.fromkeys(queries))  # drop repeated queries
+        since = (datetime.utcnow() - timedelta(days=14)).strftime("%Y-%m-%d")
+        with ThreadPoolExecutor(max_workers=min(NEWSAPI_WORKERS, len(queries))) as pool:
+            results = pool.map(lambda q: self._one_newsapi_query(q, since), queries)
+            raw: List[Dict] = [art for batch in results for art in batch]
         out: List[Dict] = []
         for art in raw:
             if not art.get("title") or not art.get("url"):
                 continue
-            art_id = hashlib.md5(f"{art['url']}{art['title']}".encode()).hexdigest()
-            if art_id in self.article_cache:
-                continue
-            self.article_cache.add(art_id)
+            art_id = _article_id(art["url"], art["title"])
             out.append(
                 {
                     "id": art_id,
@@ -402,30 +532,91 @@ class CEFNewsFetcher:
             )
         return out
 
+    def _one_newsapi_query(self, q: str, since: str) -> List[Dict]:
+        try:
+            url = "https://newsapi.org/v2/everything"
+            params = {
+                "q": q,
+                "from": since,
+                "sortBy": "publishedAt",
+                "language": "en",
+                "pageSize": 30,
+                "apiKey": self.api_keys["newsapi"],
+            }
+            # Pooled session: concurrent queries reuse keep-alive connections
+            r = self.session.get(url, params=params, timeout=30)
+            if r.status_code == 200:
+                return orjson.loads(r.content).get("articles", [])
+        except Exception as exc:
+            logger.error("NewsAPI error (%s): %s", q, exc)
+        return []
+
     # --------------------------------------------------------------------
-    # Simple deduplication via Jaccard similarity on title+summary words
+    # Deduplication via Jaccard similarity on title+summary words
     # --------------------------------------------------------------------
     @staticmethod
     def _deduplicate(articles: List[Dict]) -> List[Dict]:
-        uniques: List[Dict] = []
-        fingerprints: List[frozenset] = []
+        # Exact Jaccard dedup with prefix filtering: order each word set by
+        # batch-wide rarity; two sets can only reach the threshold if their
+        # short "prefixes" of rarest words intersect. An inverted index over
+        # kept prefixes yields the few candidates worth a full comparison.
+        tokenized: List[Tuple[Dict, frozenset]] = []
         for art in articles:
             text = f"{art.get('title','')} {art.get('summary','')}".lower()
-            words = frozenset(re.sub(r"[^\w\s]", "", text).split())
-            if not words:
-                continue
+            words = frozenset(_PUNCT_RE.sub("", text).split())
+            if words:
+                tokenized.append((art, words))
+
+        freq = Counter(w for _, words in tokenized for w in words)
+        uniques: List[Dict] = []
+        fingerprints: List[frozenset] = []
+        prefix_index: Dict[str, List[int]] = defaultdict(list)
+        for art, words in tokenized:
+            ordered = sorted(words, key=lambda w: (freq[w], w))
+            min_overlap = math.ceil(DEDUP_THRESHOLD * len(ordered) - 1e-9)
+            prefix = ordered[: len(ordered) - min_overlap + 1]
+
+            candidates = {i for w in prefix for i in prefix_index.get(w, ())}
             duplicate = False
-            for fp in fingerprints:
+            for i in candidates:
+                fp = fingerprints[i]
+                # Jaccard can never exceed min/max of the sizes; skip the intersection
+                small, large = sorted((len(words), len(fp)))
+                if small <= DEDUP_THRESHOLD * large:
+                    continue
                 inter = len(words & fp)
-                union = len(words | fp)
-                if union and inter / union > 0.7:
+                union = len(words) + len(fp) - inter  # |A∪B| without building the set
+                if union and inter / union > DEDUP_THRESHOLD:
                     duplicate = True
                     break
             if not duplicate:
+                for w in prefix:
+                    prefix_index[w].append(len(fingerprints))
                 fingerprints.append(words)
                 uniques.append(art)
         return uniques
 
+    def _classify(self, art: Dict) -> Tuple:
+        """classify_article() memoized by the classified text across fetch cycles."""
+        title = art.get("title", "")
+        content = art.get("content", art.get("summary", ""))
+        # An article's id survives edits to its body, so key on the text itself
+        h = hashlib.blake2b(title.encode(), digest_size=16)
+        h.update(b"\0")
+        h.update((content or "").encode())
+        key = h.hexdigest()
+        result = self._classified.get(key)
+        if result is None:
+            result = self.classifier.classify_article(title, content)
+            self._classified[key] = result
+            if len(self._classified) > CLASSIFY_CACHE_SIZE:
+                self._classified.popitem(last=False)
+        else:
+            self._classified.move_to_end(key)
+        cat, rel, sent, tickers, fund_names, activists = result
+        # fresh lists so articles never share (and mutate) the cached ones
+        return cat, rel, sent, list(tickers), list(fund_names), list(activists)
+
     # --------------------------------------------------------------------
     # Public API
     # --------------------------------------------------------------------
@@ -433,10 +624,21 @@ class CEFNewsFetcher:
         logger.info("Starting news fetch cycle")
         self.article_cache.clear()
 
+        # The three sources are independent I/O; run them side by side, then
+        # claim ids once all are joined so an article seen by several sources
+        # is always kept from the first of RSS, Seeking Alpha, NewsAPI.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            phases = [
+                pool.submit(self._fetch_rss_feeds),
+                pool.submit(self._scrape_seeking_alpha),
+                pool.submit(self._fetch_newsapi),
+            ]
         raw: List[Dict] = []
-        raw.extend(self._fetch_rss_feeds())
-        raw.extend(self._scrape_seeking_alpha())
-        raw.extend(self._fetch_newsapi())
+        for phase in phases:
+            for art in phase.result():
+                if art["id"] not in self.article_cache:
+                    self.article_cache.add(art["id"])
+                    raw.append(art)
         logger.info("Collected %d raw articles", len(raw))
 
         raw = self._deduplicate(raw)
@@ -445,9 +647,7 @@ class CEFNewsFetcher:
         processed: List[EnhancedNewsArticle] = []
         for art in raw:
             try:
-                cat, rel, sent, tickers, fund_names, activists = self.classifier.classify_article(
-                    art.get("title", ""), art.get("content", art.get("summary", ""))
-                )
+                cat, rel, sent, tickers, fund_names, activists = self._classify(art)
                 obj = EnhancedNewsArticle(
                     id=art["id"],
                     title=art["title"],
@@ -470,7 +670,7 @@ class CEFNewsFetcher:
             except Exception as exc:
                 logger.error("Processing error: %s", exc)
 
-        processed.sort(key=lambda x: x.priority_score, reverse=True)
+        processed.sort(key=attrgetter("priority_score"), reverse=True)
         logger.info("Returning %d relevant articles", len(processed))
         return processed
 
@@ -491,27 +691,25 @@ if __name__ == "__main__":
 
 def get_news_data():
     """Helper function to get news data as a pandas DataFrame for Streamlit display"""
+    import numpy as np
     import pandas as pd
     
     try:
         fetcher = CEFNewsFetcher()
         articles = fetcher.fetch_all_news()
         
-        # Convert to DataFrame for Streamlit display
-        data = []
-        for article in articles:
-            data.append({
-                'Title': article.title,
-                'Category': article.category,
-                'Published': article.published_at,
-                'Tickers': ', '.join(article.tickers) if article.tickers else 'N/A',
-                'Source': article.source,
-                'Article': article.url,
-                'Priority': article.priority_score,
-                'Relevance': article.relevance_score
-            })
-        
-        return pd.DataFrame(data)
+        # Convert to DataFrame for Streamlit display, one column at a time
+        n = len(articles)
+        return pd.DataFrame({
+            'Title': [a.title for a in articles],
+            'Category': [a.category for a in articles],
+            'Published': [a.published_at for a in articles],
+            'Tickers': [', '.join(a.tickers) or 'N/A' for a in articles],
+            'Source': [a.source for a in articles],
+            'Article': [a.url for a in articles],
+            'Priority': np.fromiter((a.priority_score for a in articles), dtype=float, count=n),
+            'Relevance': np.fromiter((a.relevance_score for a in articles), dtype=float, count=n),
+        })
     
     except Exception as e:
         logger.error(f"Error fetching news data: {e}")
@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime, timedelta
@@ -11,6 +12,9 @@ from pathlib import Path
 current_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(current_dir))
 
+# History charts longer than this switch from SVG to WebGL traces
+WEBGL_MIN_POINTS = 500
+
 try:
     from core.discount_fetcher import CEFDiscountFetcher
 except ImportError as e:
@@ -27,21 +31,20 @@ except ImportError as e:
         3. Check network connectivity for CEFConnect access
         """)
 else:
-    # Initialize fetcher with error handling
-    _fetcher = None
+    @st.cache_resource(show_spinner=False)
+    def _create_fetcher():
+        """One fetcher per server process so its pooled session survives reruns."""
+        return CEFDiscountFetcher()
 
+    # Initialize fetcher with error handling
     def get_fetcher():
-        global _fetcher
-        if _fetcher is None:
-            try:
-                _fetcher = CEFDiscountFetcher()
-                return _fetcher
-            except Exception as e:
-                st.error(f"Error initializing discount fetcher: {str(e)}")
-                return None
-        return _fetcher
+        try:
+            return _create_fetcher()
+        except Exception as e:
+            st.error(f"Error initializing discount fetcher: {str(e)}")
+            return None
 
-    @st.cache_data(show_spinner=True, ttl=300)  # Cache for 5 minutes
+    @st.cache_data(show_spinner=False, ttl=300)  # Cache for 5 minutes; render() shows its own spinner
     def _get_discount_data():
         """Fetch current discount data for all tracked funds."""
         fetcher = get_fetcher()
@@ -60,7 +63,8 @@ else:
             st.error(f"Error fetching discount data: {str(e)}")
             return pd.DataFrame()
 
-    @st.cache_data(show_spinner=True, ttl=300)
+    # History only moves once a day; max_entries bounds the (ticker, period) keys held in memory
+    @st.cache_data(show_spinner=True, ttl=900, max_entries=64)
     def _get_historical_data(ticker: str, period: str = "1Y"):
         """Fetch historical price and NAV data for a specific fund."""
         fetcher = get_fetcher()
@@ -69,7 +73,12 @@ else:
         
         try:
             historical_data = fetcher.fetch_historical_data(ticker, period)
-            return pd.DataFrame(historical_data) if historical_data else pd.DataFrame()
+            if not historical_data:
+                return pd.DataFrame()
+            df = pd.DataFrame(historical_data)
+            # Parse once here so the cached frame is chart-ready on every rerun
+            df['date'] = pd.to_datetime(df['date'])
+            return df
         except Exception as e:
             st.error(f"Error fetching historical data for {ticker}: {str(e)}")
             return pd.DataFrame()
@@ -104,9 +113,11 @@ else:
         if df.empty:
             st.warning("No discount data available.")
             st.info("This could be due to:")
-            st.write("- Network connectivity issues")
-            st.write("- CEFConnect website unavailable")
-            st.write("- Rate limiting restrictions")
+            st.markdown(
+                "- Network connectivity issues\n"
+                "- CEFConnect website unavailable\n"
+                "- Rate limiting restrictions"
+            )
             return
         
         # Display summary metrics
@@ -127,8 +138,14 @@ else:
         
         col1, col2, col3, col4 = st.columns(4)
         
+        # One ndarray for every statistic below; the nan* reductions skip
+        # missing values the way the pandas methods do
+        discounts = df['discount_percent'].to_numpy(dtype=float)
+        best_i = int(np.nanargmin(discounts))
+        premium_i = int(np.nanargmax(discounts))
+        
         with col1:
-            avg_discount = df['discount_percent'].mean()
+            avg_discount = np.nanmean(discounts)
             st.metric(
                 "Average Discount",
                 f"{avg_discount:.2f}%",
@@ -136,7 +153,7 @@ else:
             )
         
         with col2:
-            funds_at_discount = len(df[df['discount_percent'] < 0])
+            funds_at_discount = int((discounts < 0).sum())
             st.metric(
                 "Funds at Discount",
                 f"{funds_at_discount}/{len(df)}",
@@ -144,8 +161,8 @@ else:
             )
         
         with col3:
-            best_discount = df['discount_percent'].min()
-            best_fund = df.loc[df['discount_percent'].idxmin(), 'ticker']
+            best_discount = discounts[best_i]
+            best_fund = df['ticker'].iat[best_i]
             st.metric(
                 "Best Discount",
                 f"{best_discount:.2f}%",
@@ -153,8 +170,8 @@ else:
             )
         
         with col4:
-            highest_premium = df['discount_percent'].max()
-            premium_fund = df.loc[df['discount_percent'].idxmax(), 'ticker']
+            highest_premium = discounts[premium_i]
+            premium_fund = df['ticker'].iat[premium_i]
             if highest_premium > 0:
                 st.metric(
                     "Highest Premium",
@@ -176,7 +193,9 @@ else:
         df_sorted = df.sort_values('discount_percent')
         
         # Create color scale - red for discounts, green for premiums
-        colors = ['red' if x < 0 else 'green' for x in df_sorted['discount_percent']]
+        discounts = df_sorted['discount_percent'].to_numpy()
+        colors = np.where(discounts < 0, 'red', 'green')
+        labels = np.char.add(np.char.mod('%.1f', discounts), '%')
         
         fig = go.Figure(data=[
             go.Bar(
@@ -184,7 +203,7 @@ else:
                 x=df_sorted['discount_percent'],
                 orientation='h',
                 marker_color=colors,
-                text=[f"{x:.1f}%" for x in df_sorted['discount_percent']],
+                text=labels,
                 textposition='outside',
                 hovertemplate=(
                     "<b>%{y}</b><br>" +
@@ -212,19 +231,17 @@ else:
         """Create detailed data table with CEFConnect links."""
         st.subheader("📋 Fund Details")
         
-        # Create clickable links for fund tickers
-        df_display = df.copy()
-        df_display['Fund Link'] = df_display.apply(
-            lambda row: f"https://www.cefconnect.com/fund/{row['ticker']}", 
-            axis=1
-        )
-        
         # Select columns for display
         display_columns = [
             'ticker', 'fund_name', 'market_price', 'nav', 
             'discount_percent', 'distribution_rate'
         ]
         
+        # Create clickable links for fund tickers on a view of just the shown columns
+        df_display = df[display_columns].assign(
+            ticker="https://www.cefconnect.com/fund/" + df['ticker'].astype(str)
+        )
+        
         # Create column configuration
         column_config = {
             "ticker": st.column_config.LinkColumn(
@@ -255,57 +272,56 @@ else:
             )
         }
         
-        # Add fund links to display data
-        for idx, row in df_display.iterrows():
-            df_display.at[idx, 'ticker'] = row['Fund Link']
-        
         st.dataframe(
-            df_display[display_columns],
+            df_display,
             column_config=column_config,
             use_container_width=True,
             height=400
         )
 
+    @st.fragment
     def create_fund_analysis_section(df):
-        """Create individual fund analysis section."""
+        """Create individual fund analysis section.
+
+        Runs as a fragment so picking funds or a history period only reruns this section.
+        """
         st.subheader("🔍 Individual Fund Analysis")
         
+        fund_tickers = df['ticker'].tolist()
         selected_funds = st.multiselect(
             "Select funds for comparison:",
-            options=df['ticker'].tolist(),
-            default=df['ticker'].tolist()[:3]  # Default to first 3 funds
+            options=fund_tickers,
+            default=fund_tickers[:3]  # Default to first 3 funds
         )
         
         if selected_funds:
             # Filter data for selected funds
             selected_df = df[df['ticker'].isin(selected_funds)]
             
-            # Create comparison chart
-            fig = go.Figure()
-            
-            # Add NAV bars
-            fig.add_trace(go.Bar(
-                name='NAV',
-                x=selected_df['ticker'],
-                y=selected_df['nav'],
-                marker_color='lightblue',
-                opacity=0.7
-            ))
-            
-            # Add Market Price bars
-            fig.add_trace(go.Bar(
-                name='Market Price',
-                x=selected_df['ticker'],
-                y=selected_df['market_price'],
-                marker_color='darkblue'
-            ))
-            
-            fig.update_layout(
-                title="NAV vs Market Price Comparison",
-                xaxis_title="Fund Ticker",
-                yaxis_title="Price ($)",
-                barmode='group',
-                height=400
+            # Create comparison chart: NAV and market price bars side by side
+            fig = go.Figure(
+                data=[
+                    go.Bar(
+                        name='NAV',
+                        x=selected_df['ticker'],
+                        y=selected_df['nav'],
+                        marker_color='lightblue',
+                        opacity=0.7
+                    ),
+                    go.Bar(
+                        name='Market Price',
+                        x=selected_df['ticker'],
+                        y=selected_df['market_price'],
+                        marker_color='darkblue'
+                    )
+                ],
+                layout=go.Layout(
+                    title="NAV vs Market Price Comparison",
+                    xaxis_title="Fund Ticker",
+                    yaxis_title="Price ($)",
+                    barmode='group',
+                    height=400
+                )
             )
             
             st.plotly_chart(fig, use_container_width=True)
@@ -323,36 +339,36 @@ else:
                 historical_df = _get_historical_data(selected_funds[0], period)
                 
                 if not historical_df.empty:
-                    # Create historical price chart
-                    fig_hist = go.Figure()
-                    
-                    fig_hist.add_trace(go.Scatter(
-                        x=pd.to_datetime(historical_df['date']),
-                        y=historical_df['market_price'],
-                        name='Market Price',
-                        line=dict(color='blue')
-                    ))
-                    
-                    fig_hist.add_trace(go.Scatter(
-                        x=pd.to_datetime(historical_df['date']),
-                        y=historical_df['nav'],
-                        name='NAV',
-                        line=dict(color='green')
-                    ))
-                    
-                    fig_hist.update_layout(
-                        title=f"{selected_funds[0]} - Price History",
-                        xaxis_title="Date",
-                        yaxis_title="Price ($)",
-                        height=400
+                    # Create historical price chart; long series render on the
+                    # WebGL canvas, short ones stay SVG for crisp exports
+                    scatter = go.Scattergl if len(historical_df) > WEBGL_MIN_POINTS else go.Scatter
+                    fig_hist = go.Figure(
+                        data=[
+                            scatter(
+                                x=historical_df['date'],
+                                y=historical_df['market_price'],
+                                name='Market Price',
+                                line=dict(color='blue')
+                            ),
+                            scatter(
+                                x=historical_df['date'],
+                                y=historical_df['nav'],
+                                name='NAV',
+                                line=dict(color='green')
+                            )
+                        ],
+                        layout=go.Layout(
+                            title=f"{selected_funds[0]} - Price History",
+                            xaxis_title="Date",
+                            yaxis_title="Price ($)",
+                            height=400
+                        )
                     )
                     
                     st.plotly_chart(fig_hist, use_container_width=True)
 
     def create_sample_data():
         """Create sample data for demonstration purposes."""
-        import random
-        from datetime import datetime
         
         fund_data = [
             ("PDO", "PIMCO Dynamic Income Opportunities Fund"),
@@ -374,20 +390,18 @@ else:
             ("TTP", "Tortoise Pipeline & Energy Fund Inc.")
         ]
         
-        sample_data = []
-        for ticker, name in fund_data:
-            nav = round(random.uniform(8, 25), 2)
-            discount = round(random.uniform(-15, 5), 2)
-            market_price = round(nav * (1 + discount/100), 2)
-            
-            sample_data.append({
-                'ticker': ticker,
-                'fund_name': name,
-                'market_price': market_price,
-                'nav': nav,
-                'discount_percent': discount,
-                'distribution_rate': round(random.uniform(4, 12), 2),
-                'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M')
-            })
+        # Draw every column in one vectorised call each
+        rng = np.random.default_rng()
+        n = len(fund_data)
+        nav = rng.uniform(8, 25, n).round(2)
+        discount = rng.uniform(-15, 5, n).round(2)
         
-        return pd.DataFrame(sample_data)
+        return pd.DataFrame({
+            'ticker': [ticker for ticker, _ in fund_data],
+            'fund_name': [name for _, name in fund_data],
+            'market_price': (nav * (1 + discount / 100)).round(2),
+            'nav': nav,
+            'discount_percent': discount,
+            'distribution_rate': rng.uniform(4, 12, n).round(2),
+            'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M'),
+        })
@@ -1,7 +1,9 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 import sys
 import os
+from itertools import chain
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -26,36 +28,57 @@ except ImportError as e:
         5. Download spacy model: python -m spacy download en_core_web_sm
         """)
 else:
-    # Initialize fetcher with error handling
-    _fetcher = None
+    ARTICLE_COLUMNS = (
+        'title', 'url', 'category', 'published_at', 'tickers', 'source',
+        'fund_names', 'activist_mentions', 'priority_score',
+    )
+
+    # Built once at import; st.data_editor deep-copies each config before use
+    ARTICLE_COLUMN_CONFIG = {
+        "hide": st.column_config.CheckboxColumn("❌", help="Hide this article", width="small"),
+        "title": st.column_config.TextColumn("📰 Title", width="large"),
+        "url": st.column_config.LinkColumn("🔗 Link", display_text="Open", width="small"),
+        "category": st.column_config.TextColumn("📁 Category", width="small"),
+        "published_at": st.column_config.TextColumn("📅 Published", width="small"),
+        "tickers": st.column_config.ListColumn("🏷️ Tickers"),
+        "source": st.column_config.TextColumn("Source", width="small"),
+        "fund_names": st.column_config.ListColumn("🏢 Funds"),
+        "activist_mentions": st.column_config.ListColumn("⚡ Activists"),
+    }
+
+    @st.cache_resource(show_spinner=False)
+    def _create_fetcher():
+        """One fetcher per server process so its session and classifier caches survive reruns."""
+        return CEFNewsFetcher()
+
     def init_session_state():
         """Initialize session state for hidden rows"""
-        if "hidden_news_rows" not in st.session_state:
-            st.session_state.hidden_news_rows = set()
+        # URLs, not frame positions: the index is rebuilt on every refetch
+        if "hidden_news_urls" not in st.session_state:
+            st.session_state.hidden_news_urls = set()
+        if "news_table_version" not in st.session_state:
+            st.session_state.news_table_version = 0
 
-    def hide_news_row(row_index):
-        """Function to hide a news row"""
-        st.session_state.hidden_news_rows.add(row_index)
+    def hide_news_rows(urls):
+        """Function to hide news rows, keyed by article URL"""
+        st.session_state.hidden_news_urls.update(urls)
 
     def show_hidden_rows_count():
         """Display count of hidden rows"""
-        if st.session_state.hidden_news_rows:
-            st.info(f"🙈 Hidden items: {len(st.session_state.hidden_news_rows)}")
+        if st.session_state.hidden_news_urls:
+            st.info(f"🙈 Hidden items: {len(st.session_state.hidden_news_urls)}")
 
     def reset_hidden_rows():
         """Reset all hidden rows"""
-        st.session_state.hidden_news_rows.clear()
+        st.session_state.hidden_news_urls.clear()
 
+    # Initialize fetcher with error handling
     def get_fetcher():
-        global _fetcher
-        if _fetcher is None:
-            try:
-                _fetcher = CEFNewsFetcher()
-                return _fetcher
-            except Exception as e:
-                st.error(f"Error initializing news fetcher: {str(e)}")
-                return None
-        return _fetcher
+        try:
+            return _create_fetcher()
+        except Exception as e:
+            st.error(f"Error initializing news fetcher: {str(e)}")
+            return None
 
     @st.cache_data(show_spinner=True, ttl=600)
     def _get_articles():
@@ -67,7 +90,20 @@ else:
             articles = fetcher.fetch_all_news()
             if not articles:
                 return pd.DataFrame()
-            df = pd.DataFrame([a.to_dict() for a in articles])
+            # Column-wise build of just the fields the panel shows; summary/content stay out of the cache
+            df = pd.DataFrame({
+                name: [getattr(a, name) for a in articles] for name in ARTICLE_COLUMNS
+            })
+            # Few distinct values: filter on integer codes instead of strings
+            for col in ('category', 'source'):
+                if col in df.columns:
+                    df[col] = df[col].astype('category')
+            # Sidebar filter options, computed once per fetch instead of per rerun
+            df.attrs['all_tickers'] = sorted(
+                set(chain.from_iterable(t for t in df['tickers'] if isinstance(t, list)))
+            )
+            # astype('category') already stores the distinct values in sorted order
+            df.attrs['all_categories'] = df['category'].cat.categories.tolist()
             return df
         except Exception as e:
             st.error(f"Error fetching articles: {str(e)}")
@@ -101,10 +137,12 @@ else:
 
         if df.empty:
             st.info("No relevant news found. This could be due to:")
-            st.write("- Missing API keys")
-            st.write("- Network connectivity issues")
-            st.write("- All articles filtered out as irrelevant")
-            st.write("- API rate limits reached")
+            st.markdown(
+                "- Missing API keys\n"
+                "- Network connectivity issues\n"
+                "- All articles filtered out as irrelevant\n"
+                "- API rate limits reached"
+            )
             return
 
         # Show basic stats
@@ -117,13 +155,9 @@ else:
             # Handle tickers filter safely
             if 'tickers' in df.columns:
                 try:
-                    all_tickers = set()
-                    for ticker_list in df.tickers:
-                        if isinstance(ticker_list, list):
-                            all_tickers.update(ticker_list)
                     tickers = st.multiselect(
                         "Filter by ticker:",
-                        sorted(all_tickers) if all_tickers else []
+                        df.attrs.get('all_tickers', [])
                     )
                 except Exception:
                     tickers = []
@@ -134,7 +168,7 @@ else:
             if 'category' in df.columns:
                 categories = st.multiselect(
                     "Filter by category:",
-                    sorted(df.category.unique())
+                    df.attrs.get('all_categories', [])
                 )
             else:
                 categories = []
@@ -145,19 +179,20 @@ else:
             else:
                 min_priority = 0.0
 
-        # Apply filters
-        mask = pd.Series([True] * len(df))
+        # Apply filters on a plain boolean array, one in-place AND per condition
+        mask = np.ones(len(df), dtype=bool)
 
         if 'priority_score' in df.columns:
-            mask &= (df.priority_score >= min_priority)
+            mask &= (df.priority_score >= min_priority).to_numpy()
 
         if tickers and 'tickers' in df.columns:
-            mask &= df.tickers.apply(
-                lambda lst: any(t in lst for t in tickers) if isinstance(lst, list) else False
-            )
+            # One row per (article, ticker); rows with no tickers explode to NaN
+            exploded = df.tickers.explode()
+            hits = exploded.isin(set(tickers)).groupby(level=0).any()
+            mask &= hits.reindex(df.index, fill_value=False).to_numpy()
 
         if categories and 'category' in df.columns:
-            mask &= df.category.isin(categories)
+            mask &= df.category.isin(categories).to_numpy()
 
         filtered_df = df[mask]
 
@@ -165,8 +200,13 @@ else:
             st.info("No articles match your filter criteria")
             return
 
+        _render_articles(filtered_df)
+
+    @st.fragment
+    def _render_articles(filtered_df):
+        """Hidden-row controls and article table; hide/reset rerun only this block."""
         # Filter out hidden rows
-        visible_df = filtered_df[~filtered_df.index.isin(st.session_state.hidden_news_rows)]
+        visible_df = filtered_df[~filtered_df['url'].isin(st.session_state.hidden_news_urls)]
 
         # Control buttons for hidden functionality
         col1, col2, col3 = st.columns([2, 1, 1])
@@ -175,7 +215,7 @@ else:
         with col2:
             if st.button("🔄 Reset Hidden", help="Show all hidden rows again"):
                 reset_hidden_rows()
-                st.rerun()
+                st.rerun(scope="fragment")
         with col3:
             st.metric("Visible Articles", len(visible_df))
 
@@ -190,82 +230,33 @@ else:
         if 'priority_score' in visible_df.columns:
             visible_df = visible_df.sort_values("priority_score", ascending=False)
 
-
-        VISIBLE_COLS = [
-            "title", "category", "published_at", "tickers", "url", "source","fund_names", "activists"
-        ]
-        existing_cols = [col for col in VISIBLE_COLS if col in filtered_df.columns]
-        display_df = filtered_df[existing_cols].copy()
-        # Display articles in table format with integrated hide buttons
+        # One editable table instead of a row of widgets per article; only "hide" is editable
         st.subheader(f"📰 News Articles ({len(visible_df)} visible)")
 
-        # Create table headers
-        header_cols = st.columns([5, 1.2, 1.5, 1.8, 1.2, 0.8])
-        with header_cols[0]:
-            st.markdown("**📰 Title**")
-        with header_cols[1]:
-            st.markdown("**📁 Category**")
-        with header_cols[2]:
-            st.markdown("**📅 Published**")
-        with header_cols[3]:
-            st.markdown("**🏷️ Tickers**")
-        with header_cols[4]:
-            st.markdown("**🔗 Source**")
-        with header_cols[5]:
-            st.markdown("**Action**")
-
-        st.markdown("---")
-
-        # Display each article as a table row
-        for idx, row in visible_df.iterrows():
-            cols = st.columns([5, 1.2, 1.5, 1.8, 1.2, 0.8])
-            
-            with cols[0]:
-                title = row.get('title', 'No Title')
-                if 'url' in row and pd.notna(row['url']):
-                    st.markdown(f"[{title}]({row['url']})")
-                else:
-                    st.write(title)
-                
-                # Show additional info in smaller text below title
-                additional_info = []
-                if 'fund_names' in row and row['fund_names']:
-                    fund_names = ', '.join(row['fund_names']) if isinstance(row['fund_names'], list) else str(row['fund_names'])
-                    additional_info.append(f"🏢 {fund_names}")
-                if 'activist_mentions' in row and row['activist_mentions']:
-                    activists = ', '.join(row['activist_mentions']) if isinstance(row['activist_mentions'], list) else str(row['activist_mentions'])
-                    additional_info.append(f"⚡ {activists}")
-                
-                if additional_info:
-                    st.caption(" • ".join(additional_info))
-            
-            with cols[1]:
-                st.write(row.get('category', 'N/A'))
-            
-            with cols[2]:
-                pub_date = str(row.get('published_at', 'N/A'))
-                # Format date nicely
-                if pub_date != 'N/A' and len(pub_date) > 10:
-                    st.write(pub_date[:10])
-                else:
-                    st.write(pub_date)
-            
-            with cols[3]:
-                if 'tickers' in row and row['tickers']:
-                    tickers_display = ', '.join(row['tickers']) if isinstance(row['tickers'], list) else str(row['tickers'])
-                    st.write(tickers_display)
-                else:
-                    st.write('N/A')
-            
-            with cols[4]:
-                st.write(row.get('source', 'N/A'))
-            
-            with cols[5]:
-                if st.button("❌", key=f"hide_table_{idx}", help="Hide this article"):
-                    hide_news_row(idx)
-                    st.rerun()
-            
-            # Add subtle divider between rows
-            st.markdown('<hr style="margin: 5px 0; opacity: 0.3;">', unsafe_allow_html=True)
-
-        
+        display_df = pd.DataFrame({
+            'hide': False,
+            'title': visible_df['title'],
+            'url': visible_df['url'],
+            'category': visible_df['category'],
+            'published_at': visible_df['published_at'].astype(str).str.slice(0, 10),
+            'tickers': visible_df['tickers'],
+            'source': visible_df['source'],
+            'fund_names': visible_df['fund_names'],
+            'activist_mentions': visible_df['activist_mentions'],
+        }, index=visible_df.index)
+
+        # Versioned key: after hiding, the table restarts with no leftover checkbox edits
+        edited = st.data_editor(
+            display_df,
+            column_config=ARTICLE_COLUMN_CONFIG,
+            disabled=[c for c in display_df.columns if c != 'hide'],
+            hide_index=True,
+            width="stretch",
+            key=f"news_table_{st.session_state.news_table_version}",
+        )
+
+        newly_hidden = edited.loc[edited['hide'], 'url']
+        if len(newly_hidden):
+            hide_news_rows(newly_hidden)
+            st.session_state.news_table_version += 1
+            st.rerun(scope="fragment")
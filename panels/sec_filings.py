@@ -1,3 +1,5 @@
+import logging
+import numpy as np
 import pandas as pd
 import streamlit as st
 import sys
@@ -25,67 +27,104 @@ except ImportError as e:
         3. Check database permissions for data/ directory
         """)
 else:
-    # Initialize fetcher with error handling - using DEFAULT_TICKER_MAP
-    _fetcher = None
+    # Child of the fetcher's logger, so both are configured together
+    logger = logging.getLogger("cef.sec_filings.panel")
+
+    @st.cache_resource(show_spinner=False)
+    def _create_fetcher():
+        """One fetcher per server process so its session, DB connection and ETags survive reruns."""
+        # Create fetcher without custom ticker_map to use DEFAULT_TICKER_MAP
+        fetcher = CEFSecFilingsFetcher()
+        
+        # Debug: Verify ticker map
+        logger.debug("Fetcher initialized with %d tickers: %s",
+                     len(fetcher.ticker_map), list(fetcher.ticker_map))
+        
+        # Check for problematic tickers
+        problematic_tickers = {'JPM', 'NVDA', 'BRK-B', 'BRKB'}
+        found_problematic = problematic_tickers.intersection(set(fetcher.ticker_map.keys()))
+        if found_problematic:
+            logger.warning("Found non-CEF tickers: %s", sorted(found_problematic))
+        
+        return fetcher
 
+    # Initialize fetcher with error handling - using DEFAULT_TICKER_MAP
     def get_fetcher():
-        global _fetcher
-        if _fetcher is None:
-            try:
-                # Create fetcher without custom ticker_map to use DEFAULT_TICKER_MAP
-                _fetcher = CEFSecFilingsFetcher()
-                
-                # Debug: Verify ticker map
-                print(f"[DEBUG] Fetcher initialized with {len(_fetcher.ticker_map)} tickers:")
-                print(f"[DEBUG] CEF tickers: {list(_fetcher.ticker_map.keys())}")
-                
-                # Check for problematic tickers
-                problematic_tickers = {'JPM', 'NVDA', 'BRK-B', 'BRKB'}
-                found_problematic = problematic_tickers.intersection(set(_fetcher.ticker_map.keys()))
-                if found_problematic:
-                    print(f"[WARNING] Found non-CEF tickers: {found_problematic}")
-                
-                return _fetcher
-            except Exception as e:
-                st.error(f"Error initializing SEC filings fetcher: {str(e)}")
-                return None
-        return _fetcher
+        try:
+            return _create_fetcher()
+        except Exception as e:
+            st.error(f"Error initializing SEC filings fetcher: {str(e)}")
+            return None
+
+    FILING_COLUMNS = (
+        'filing_id', 'cik', 'fund_name', 'ticker', 'filing_type', 'filing_date',
+        'acceptance_date', 'accession_number', 'filer_name', 'url', 'is_activist',
+    )
+
+    # Table layout is fixed, so its column configs are built once at import;
+    # st.dataframe deep-copies each config before applying its own changes
+    ALL_VISIBLE_COLS = [
+        "filing_date", "ticker", "fund_name", "filing_type", 
+        "filer_name", "url"
+    ]
+    FILING_COLUMN_CONFIG = {
+        "filing_date": st.column_config.DateColumn("Filing Date", width="medium"),
+        "ticker": st.column_config.TextColumn("Ticker", width="small"),
+        "fund_name": st.column_config.TextColumn("Fund Name", width="large"),
+        "filing_type": st.column_config.TextColumn("Type", width="small"),
+        "filer_name": st.column_config.TextColumn("Filer", width="large"),
+        "url": st.column_config.LinkColumn("SEC Filing", width="small"),
+    }
+    ACTIVIST_COLUMN_CONFIG = {
+        "Filings": st.column_config.NumberColumn("Number of Filings"),
+        "Funds Targeted": st.column_config.NumberColumn("Unique Funds Targeted"),
+    }
+
+    def _filings_frame(filings):
+        """Build the filings DataFrame column by column straight from the dataclass fields."""
+        df = pd.DataFrame({
+            name: [getattr(f, name) for f in filings] for name in FILING_COLUMNS
+        })
+        df['is_activist'] = df['is_activist'].astype(bool)
+        # Few distinct values: filter and group on integer codes instead of strings
+        for col in ('ticker', 'filing_type', 'filer_name'):
+            df[col] = df[col].astype('category')
+        return df
 
-    
     @st.cache_data(show_spinner=True, ttl=3600)  # Cache for 1 hour
     def _get_filings(days_back: int, use_cache: bool = True):
         """Fetch SEC filings with caching"""
         fetcher = get_fetcher()
         if fetcher is None:
-            return []
+            return pd.DataFrame()
         
         try:
-            print(f"[DEBUG] _get_filings called with days_back={days_back}, use_cache={use_cache}")
+            logger.debug("_get_filings called with days_back=%s, use_cache=%s", days_back, use_cache)
             
             if use_cache:
                 filings = fetcher.get_cached_filings(days_back=days_back)
-                print(f"[DEBUG] Used cache: {len(filings)} filings loaded")
+                logger.debug("Used cache: %d filings loaded", len(filings))
                 if filings:
-                    return filings
+                    return _filings_frame(filings)
                 st.info("No cached filings found. Fetching from SEC API...")
             
-            print("[DEBUG] Calling live fetch")
+            logger.debug("Calling live fetch")
             filings = fetcher.fetch_cef_filings(days_back=days_back)
-            print(f"[DEBUG] Live fetch completed: {len(filings)} filings loaded")
+            logger.debug("Live fetch completed: %d filings loaded", len(filings))
             
             # Debug: Show which tickers have filings
-            if filings:
+            if filings and logger.isEnabledFor(logging.DEBUG):
                 ticker_counts = {}
                 for filing in filings:
                     ticker = filing.ticker
                     ticker_counts[ticker] = ticker_counts.get(ticker, 0) + 1
-                print(f"[DEBUG] Filings by ticker: {ticker_counts}")
+                logger.debug("Filings by ticker: %s", ticker_counts)
             
-            return filings
+            return _filings_frame(filings) if filings else pd.DataFrame()
         except Exception as e:
             st.error(f"Error fetching filings: {str(e)}")
-            print(f"[DEBUG] Error in _get_filings: {str(e)}")
-            return []
+            logger.error("Error in _get_filings: %s", e)
+            return pd.DataFrame()
 
     def render():
         st.header("📋 SEC Filings Monitor")
@@ -122,12 +161,11 @@ else:
                 try:
                     # Close the database connection first
                     fetcher = get_fetcher()
-                    if fetcher and hasattr(fetcher, 'conn'):
-                        fetcher.conn.close()
+                    if fetcher:
+                        fetcher.close_connection()
                     
-                    # Clear the global fetcher instance
-                    global _fetcher
-                    _fetcher = None
+                    # Drop the shared fetcher so the next run reconnects
+                    _create_fetcher.clear()
                     
                     # Now safely remove the database file
                     import os
@@ -150,8 +188,8 @@ else:
                     fetcher = get_fetcher()
                     if fetcher and hasattr(fetcher, 'conn'):
                         cursor = fetcher.conn.cursor()
+                        # No VACUUM here: it rewrites the whole file; freed pages are reused by the next fetch
                         cursor.execute("DELETE FROM sec_filings")
-                        cursor.execute("VACUUM")  # Reclaim disk space
                         fetcher.conn.commit()
                         
                     st.success("Database contents cleared! Will fetch fresh CEF data.")
@@ -179,43 +217,23 @@ else:
 
         # Fetch filings
         with st.spinner(f"Loading SEC filings for the last {days_back} days..."):
-            filings = _get_filings(days_back=days_back, use_cache=use_cache)
+            df = _get_filings(days_back=days_back, use_cache=use_cache)
 
-        if not filings:
+        if df.empty:
             st.info("No SEC filings found for the specified period.")
             st.write("This could be due to:")
-            st.write("- No recent 13D/13G/13A filings for tracked CEFs")
-            st.write("- SEC API connectivity issues")
-            st.write("- Rate limiting or access restrictions")
-            st.write("- Try increasing the lookback period to 180+ days")
+            st.markdown(
+                "- No recent 13D/13G/13A filings for tracked CEFs\n"
+                "- SEC API connectivity issues\n"
+                "- Rate limiting or access restrictions\n"
+                "- Try increasing the lookback period to 180+ days"
+            )
             
             # Show which CEFs we're monitoring
             if fetcher:
                 st.write(f"**Monitoring {len(fetcher.ticker_map)} CEFs:** {', '.join(fetcher.ticker_map.keys())}")
             return
 
-        # Convert to DataFrame
-        df = pd.DataFrame([filing.to_dict() for filing in filings])
-        if filings:
-            df = pd.DataFrame([filing.to_dict() for filing in filings])
-            
-            # Expected CEF tickers from DEFAULT_TICKER_MAP
-            expected_cef_tickers = {
-                'PDO', 'PDI', 'PHK', 'BST', 'BDJ', 'JFR', 'ETG', 'ASA', 
-                'SWZ', 'ECF', 'BCV', 'NBXG', 'JOF', 'GAM', 'BIGZ', 'BMEZ', 'TTP'
-            }
-            
-            df_tickers = set(df['ticker'].unique()) if 'ticker' in df.columns else set()
-            non_cef_tickers = df_tickers - expected_cef_tickers
-            
-
-        # Verify we have CEF data, not JPM/non-CEF data
-        cef_tickers = set(fetcher.ticker_map.keys()) if fetcher else set()
-        df_tickers = set(df['ticker'].unique()) if 'ticker' in df.columns else set()
-        non_cef_tickers = df_tickers - cef_tickers
-        
-
-
         # Summary metrics
         col1, col2, col3 = st.columns(3)
         
@@ -239,14 +257,14 @@ else:
         with filter_col1:
             selected_types = st.multiselect(
                 "Filing Types:",
-                options=sorted(df['filing_type'].unique()) if 'filing_type' in df.columns else [],
+                options=df['filing_type'].cat.categories.tolist() if 'filing_type' in df.columns else [],
                 default=[]
             )
         
         with filter_col2:
             selected_filers = st.multiselect(
                 "Filers:",
-                options=sorted(df['filer_name'].unique()) if 'filer_name' in df.columns else [],
+                options=df['filer_name'].cat.categories.tolist() if 'filer_name' in df.columns else [],
                 default=[]
             )
         
@@ -257,31 +275,28 @@ else:
                 index=0
             )
 
-        # Apply filters
-        filtered_df = df.copy()
+        # Apply filters: AND each condition into one boolean array, then slice once
+        mask = np.ones(len(df), dtype=bool)
         
-        if selected_types and 'filing_type' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['filing_type'].isin(selected_types)]
+        if selected_types and 'filing_type' in df.columns:
+            mask &= df['filing_type'].isin(selected_types).to_numpy()
         
-        if selected_filers and 'filer_name' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['filer_name'].isin(selected_filers)]
+        if selected_filers and 'filer_name' in df.columns:
+            mask &= df['filer_name'].isin(selected_filers).to_numpy()
         
-        if 'is_activist' in filtered_df.columns:
+        if 'is_activist' in df.columns:
             if activist_filter == "Activist Only":
-                filtered_df = filtered_df[filtered_df['is_activist'] == True]
+                mask &= (df['is_activist'] == True).to_numpy()
             elif activist_filter == "Non-Activist Only":
-                filtered_df = filtered_df[filtered_df['is_activist'] == False]
+                mask &= (df['is_activist'] == False).to_numpy()
+        
+        filtered_df = df[mask]
 
         if filtered_df.empty:
             st.warning("No filings match the selected filters.")
             return
 
-        # Define visible columns - only include columns that exist
-        ALL_VISIBLE_COLS = [
-            "filing_date", "ticker", "fund_name", "filing_type", 
-            "filer_name", "url"
-        ]
-        
+        # Only include visible columns that exist
         VISIBLE_COLS = [col for col in ALL_VISIBLE_COLS if col in filtered_df.columns]
         
         # Filter DataFrame to show only desired columns
@@ -294,20 +309,8 @@ else:
         # Display filings table
         st.subheader(f"📋 SEC Filings ({len(display_df)} records)")
         
-        # Create column config based on available columns
-        column_config = {}
-        if 'filing_date' in VISIBLE_COLS:
-            column_config["filing_date"] = st.column_config.DateColumn("Filing Date", width="medium")
-        if 'ticker' in VISIBLE_COLS:
-            column_config["ticker"] = st.column_config.TextColumn("Ticker", width="small")
-        if 'fund_name' in VISIBLE_COLS:
-            column_config["fund_name"] = st.column_config.TextColumn("Fund Name", width="large")
-        if 'filing_type' in VISIBLE_COLS:
-            column_config["filing_type"] = st.column_config.TextColumn("Type", width="small")
-        if 'filer_name' in VISIBLE_COLS:
-            column_config["filer_name"] = st.column_config.TextColumn("Filer", width="large")
-        if 'url' in VISIBLE_COLS:
-            column_config["url"] = st.column_config.LinkColumn("SEC Filing", width="small")
+        # Column config based on available columns
+        column_config = {c: FILING_COLUMN_CONFIG[c] for c in VISIBLE_COLS}
         
         st.dataframe(
             display_df.reset_index(drop=True),
@@ -322,38 +325,38 @@ else:
             if not activist_filings.empty:
                 st.subheader("🎯 Activist Investor Activity")
                 
-                agg_dict = {'filing_id': 'count'}
+                # Filing counts straight from value_counts; unique funds per filer
+                # as non-null funds among the distinct (filer, fund) pairs, no groupby nunique.
+                # filer_name is categorical: keep only filers present in this subset
+                filer_counts = activist_filings['filer_name'].value_counts(sort=False)
+                summary_parts = [filer_counts[filer_counts > 0].rename('Filings')]
                 if 'fund_name' in activist_filings.columns:
-                    agg_dict['fund_name'] = 'nunique'
-                
-                activist_summary = activist_filings.groupby('filer_name').agg(agg_dict).round(2)
+                    summary_parts.append(
+                        activist_filings.drop_duplicates(['filer_name', 'fund_name'])
+                        .groupby('filer_name', observed=True)['fund_name'].count().rename('Funds Targeted')
+                    )
                 
-                # Rename columns based on what we have
-                column_names = ['Filings']
-                if 'fund_name' in agg_dict:
-                    column_names.append('Funds Targeted')
-                
-                activist_summary.columns = column_names
-                activist_summary = activist_summary.sort_values('Filings', ascending=False)
+                activist_summary = (
+                    pd.concat(summary_parts, axis=1)
+                    .sort_index()
+                    .sort_values('Filings', ascending=False)
+                )
                 
                 st.dataframe(
                     activist_summary,
                     use_container_width=True,
-                    column_config={
-                        "Filings": st.column_config.NumberColumn("Number of Filings"),
-                        "Funds Targeted": st.column_config.NumberColumn("Unique Funds Targeted")
-                    }
+                    column_config=ACTIVIST_COLUMN_CONFIG
                 )
 
-        # Download option
-        if st.button("📥 Download Data as CSV"):
-            csv = display_df.to_csv(index=False)
-            st.download_button(
-                label="Download SEC Filings CSV",
-                data=csv,
-                file_name=f"sec_filings_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv"
-            )
+        # Download option: the CSV is only serialized when the button is clicked,
+        # and the click itself does not rerun the page
+        st.download_button(
+            label="📥 Download SEC Filings CSV",
+            data=lambda: display_df.to_csv(index=False),
+            file_name=f"sec_filings_{datetime.now().strftime('%Y%m%d')}.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
 
         # Debug information at the bottom
         with st.expander("🔧 Debug Information"):
@@ -367,4 +370,9 @@ else:
             if fetcher:
                 st.write("**Fetcher Info:**")
                 st.write(f"Ticker map contains: {list(fetcher.ticker_map.keys())}")
-                st.write(f"Database path: {fetcher.conn}")
\ No newline at end of file
+                st.write(f"Database path: {fetcher.conn}")
+                
+                # Verify we have CEF data, not JPM/non-CEF data (activist filings may carry no ticker)
+                non_cef_tickers = set(df['ticker'].unique()) - set(fetcher.ticker_map) - {'', None}
+                if non_cef_tickers:
+                    st.caption(f"Filings for tickers outside the CEF map: {', '.join(sorted(non_cef_tickers))}")
\ No newline at end of file
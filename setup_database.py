@@ -14,6 +14,10 @@ def setup_database():
     conn = sqlite3.connect(str(db_path))
     cursor = conn.cursor()
     
+    # WAL is stored in the database file, so the dashboard can read while a fetch writes
+    # (per-connection pragmas such as synchronous are set by the fetcher on connect)
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
     # Create tables
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS sec_filings (
@@ -44,13 +48,12 @@ def setup_database():
         )
     ''')
     
-    # Create indexes for performance
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_filing_date ON sec_filings(filing_date)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_cik ON sec_filings(cik)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ticker ON sec_filings(ticker)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_is_activist ON sec_filings(is_activist)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_filing_type ON sec_filings(filing_type)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_filer_name ON sec_filings(filer_name)')
+    # Index the one access path the app uses: a filing_date window, newest first.
+    # The old single-column indexes were never queried and only slowed inserts.
+    for stale in ('idx_filing_date', 'idx_cik', 'idx_ticker', 'idx_is_activist',
+                  'idx_filing_type', 'idx_filer_name'):
+        cursor.execute(f'DROP INDEX IF EXISTS {stale}')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_sec_filings_date_id ON sec_filings(filing_date DESC, filing_id)')
     
     conn.commit()
     conn.close()